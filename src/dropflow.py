@@ -4,14 +4,102 @@ Implements incremental rainflow cycle counting algorythm for fatigue analysis
 according to section 5.4.4 in ASTM E1049-85 (2011).
 """
 from __future__ import division
-from collections import deque, defaultdict
+from array import array
+from typing import NamedTuple
+import numpy as np
 
-def format_output(point1, point2, count):
-            i1, x1 = point1
-            i2, x2 = point2
-            rng = abs(x1 - x2)
-            mean = 0.5 * (x1 + x2)
-            return rng, mean, count, i1, i2
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # numba is optional: without it a pure-Python stack reducer is used
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+# Initial size of the reversal buffers; they are doubled on demand
+_INITIAL_CAPACITY = 1024
+
+# Below this many reversals the pure-Python reducer wins: it avoids the
+# first-call JIT compilation of the kernel and the per-call dispatch cost
+_KERNEL_THRESHOLD = 64
+
+
+class Cycle(NamedTuple):
+    """
+    One emitted cycle. Compares equal to the plain
+    (range, mean, count, start index, end index) tuple it replaces, but
+    exposes the fields as named attributes.
+    """
+    rng: float
+    mean: float
+    count: float
+    i1: int
+    i2: int
+
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _rainflow_stack(vals, idxs, out_rng, out_mean, out_count, out_i1, out_i2):
+    """
+    Three-point rainflow reduction (ASTM E1049-85, 5.4.4) over parallel
+    value/index arrays.
+
+    The stack lives in-place in vals[:sp]/idxs[:sp]; closed cycles and the
+    starting half cycles are written into the preallocated out_* arrays,
+    which must be at least as long as vals (every input point emits at most
+    one row). Returns (number of rows emitted, residue length). The residue
+    is left compacted at the front of vals/idxs.
+    """
+    n = vals.shape[0]
+    sp = 0
+    m = 0
+    for k in range(n):
+        vals[sp] = vals[k]
+        idxs[sp] = idxs[k]
+        sp += 1
+
+        while sp >= 3:
+            # Form ranges X and Y from the three most recent points; the
+            # squared differences compare the same way as the absolute
+            # values, without the two abs calls per iteration
+            x1, x2, x3 = vals[sp-3], vals[sp-2], vals[sp-1]
+            dX = x3 - x2
+            dY = x2 - x1
+
+            if dX * dX < dY * dY:
+                # Read the next point
+                break
+            Y = -dY if dY < 0.0 else dY
+
+            if sp == 3:
+                # Y contains the starting point
+                # Count Y as one-half cycle and discard the first point
+                out_rng[m] = Y
+                out_mean[m] = (x1 + x2) * 0.5
+                out_count[m] = 0.5
+                out_i1[m] = idxs[0]
+                out_i2[m] = idxs[1]
+                m += 1
+                vals[0] = vals[1]
+                idxs[0] = idxs[1]
+                vals[1] = vals[2]
+                idxs[1] = idxs[2]
+                sp = 2
+            else:
+                # Count Y as one cycle and discard the peak and the valley of Y
+                out_rng[m] = Y
+                out_mean[m] = (x1 + x2) * 0.5
+                out_count[m] = 1.0
+                out_i1[m] = idxs[sp-3]
+                out_i2[m] = idxs[sp-2]
+                m += 1
+                vals[sp-3] = vals[sp-1]
+                idxs[sp-3] = idxs[sp-1]
+                sp -= 2
+    return m, sp
 
 
 class Dropflow:
@@ -22,51 +110,138 @@ class Dropflow:
     
     Attributes
     ----------
-    _reversals (list): list of tuples containing the indexes and values of the reversal points.
+    _rev_idx (np.ndarray): preallocated int64 buffer holding the indexes of the open reversal points.
+    _rev_val (np.ndarray): preallocated float64 buffer holding the values of the open reversal points.
+    _rev_n (int): number of valid entries in _rev_idx/_rev_val. The two buffers are parallel
+        (structure of arrays) so the hot loops index contiguous typed memory instead of
+        chasing pointers through a list of tuples.
     _stopper (tuple): tuple containing the index and value of the last point that in the original
         algorithm is threated as a reversal point. Here, since we are working with incremental data,
         we don't know if the last point is a reversal point until the next point is read. Thus, we
         store the last point in the _stopper attribute and update it when the next point is read.
-    _closed_cycles (list): list of tuples containing the indexes and values of the closed cycles. This
-        attribute is used to store the closed cycles and half cycles that are already formed when the 
-        user calls the method extract_all_cycles. Otherwise, the method extract_new_cycles yields only
-        the new closed cycles or half cycles.
-    _mean (float): mean value of the series.
+    _cc_rng, _cc_mean, _cc_count (array): typed double buffers holding one field each of the
+        closed cycles, and _cc_i1, _cc_i2 (array) the int64 start/end indexes. Cycles are appended
+        here as soon as they close, either while points are added or when a stopper-triggered
+        closure happens inside the extraction methods; keeping the fields in parallel typed
+        arrays instead of a list of tuples shrinks the memory per cycle several-fold and lets
+        closed_cycles_array hand the history to NumPy without boxing.
+    _cursor (int): number of closed cycles already yielded by extract_new_cycles.
+    _yield_cursor (int): number of closed cycles already yielded by extract_all_cycles.
+    _sum (float): running sum of the series, from which the mean property is derived on demand.
     _history_length (int): number of points read.
     _idx_last (int): index of the last point read.
     _x_last (float): value of the last point read.
     _x (float): value of the current point.
-    _d_last (float): difference between the last two points read.
+    _d_last_sign (int): sign (-1, 0 or +1) of the difference between the last two points read.
+        Only the sign matters for reversal detection, so the float delta is not kept.
     """
-    def __init__(self) -> None:
-        self._reversals = []
+    __slots__ = (
+        "_rev_idx", "_rev_val", "_rev_n", "_stopper",
+        "_cc_rng", "_cc_mean", "_cc_count", "_cc_i1", "_cc_i2",
+        "_cursor", "_yield_cursor",
+        "_sum", "_history_length", "_idx_last", "_x_last", "_x", "_d_last_sign",
+    )
+
+    def __init__(self, capacity_hint: int = 0) -> None:
+        # A caller that knows the rough reversal count of its stream can
+        # pre-size the buffers and avoid the doubling regrowths entirely
+        capacity = max(int(capacity_hint), _INITIAL_CAPACITY)
+        self._rev_idx = np.empty(capacity, dtype=np.int64)
+        self._rev_val = np.empty(capacity, dtype=np.float64)
+        self._rev_n = 0
         self._stopper = ()
-        self._closed_cycles = []
+        self._cc_rng = array('d')
+        self._cc_mean = array('d')
+        self._cc_count = array('d')
+        self._cc_i1 = array('q')
+        self._cc_i2 = array('q')
+        self._cursor = 0
+        self._yield_cursor = 0
 
-        self._mean = 0
+        self._sum = 0.0
         self._history_length = 0
         self._idx_last = None
         self._x_last = None
         self._x = None
-        self._d_last = None
+        self._d_last_sign = 0
     
+    @property
+    def mean(self):
+        """Mean of the whole series, derived lazily from the running sum."""
+        return self._sum / self._history_length if self._history_length else 0.0
+
     @property
     def reversals(self):
         if self._history_length < 2:
             return []
-        return self._reversals + [self._stopper] if self._stopper else self._reversals
-        
+        # _residue_points already hands back a fresh list, so the stopper can
+        # be appended in place instead of concatenating into a second copy
+        points = self._residue_points()
+        if self._stopper:
+            points.append(self._stopper)
+        return points
+
+    def closed_cycles_array(self):
+        """
+        Return every closed cycle so far as a NumPy structured array with
+        fields (rng, mean, count, i1, i2), one row per cycle. The field
+        columns are copied straight out of the typed buffers, so no Python
+        objects are created along the way.
+        """
+        n = len(self._cc_rng)
+        out = np.empty(n, dtype=[('rng', 'f8'), ('mean', 'f8'), ('count', 'f8'),
+                                 ('i1', 'i8'), ('i2', 'i8')])
+        if n:
+            out['rng'] = np.frombuffer(self._cc_rng, dtype=np.float64)
+            out['mean'] = np.frombuffer(self._cc_mean, dtype=np.float64)
+            out['count'] = np.frombuffer(self._cc_count, dtype=np.float64)
+            out['i1'] = np.frombuffer(self._cc_i1, dtype=np.int64)
+            out['i2'] = np.frombuffer(self._cc_i2, dtype=np.int64)
+        return out
+
+    def _cycles_from(self, start):
+        """Yield the closed cycles stored from row start onwards."""
+        rng, mean, count = self._cc_rng, self._cc_mean, self._cc_count
+        i1, i2 = self._cc_i1, self._cc_i2
+        for k in range(start, len(rng)):
+            yield Cycle(rng[k], mean[k], count[k], i1[k], i2[k])
+
+    def _residue_points(self):
+        """Return the open reversal points as a list of (index, value) tuples."""
+        n = self._rev_n
+        return list(zip(self._rev_idx[:n].tolist(), self._rev_val[:n].tolist()))
+
+    def _push_reversal(self, idx, x) -> None:
+        """Append a reversal point, doubling the buffers when they are full."""
+        n = self._rev_n
+        if n == self._rev_val.shape[0]:
+            self._rev_idx = np.resize(self._rev_idx, 2 * n)
+            self._rev_val = np.resize(self._rev_val, 2 * n)
+        self._rev_idx[n] = idx
+        self._rev_val[n] = x
+        self._rev_n = n + 1
+
+
     def reset(self):
-        self._reversals = []
+        # Only the logical lengths go back to zero; the allocated buffers are
+        # kept warm (del arr[:] empties an array in place), so a reused
+        # instance does not pay the allocations again
+        self._rev_n = 0
         self._stopper = ()
-        self._closed_cycles = []
+        del self._cc_rng[:]
+        del self._cc_mean[:]
+        del self._cc_count[:]
+        del self._cc_i1[:]
+        del self._cc_i2[:]
+        self._cursor = 0
+        self._yield_cursor = 0
 
-        self._mean = 0
+        self._sum = 0.0
         self._history_length = 0
         self._idx_last = None
         self._x_last = None
         self._x = None
-        self._d_last = None
+        self._d_last_sign = 0
         
     def add_point(self, x: float, idx: int) -> None:
         """
@@ -78,9 +253,95 @@ class Dropflow:
         idx (int): index of the point
         """
         self._check_reversal(x, idx)
-        self._mean = (self._mean * (self._history_length) + x) / (self._history_length + 1)
+        self._sum += x
         self._history_length += 1
-    
+
+    def add_points(self, xs, idxs=None) -> None:
+        """
+        Add a batch of points to the series.
+
+        Equivalent to calling add_point once per sample, but reversal detection
+        is vectorized with NumPy: runs of equal values are collapsed and sign
+        changes of the first derivative are located in a single C-level pass,
+        so only the (few) reversal points are touched from Python. Plateaus
+        are detected by exact equality, matching the scalar path; a tolerance
+        would merge nearly-flat oscillations and change the counted cycles.
+
+        Parameters
+        ----------
+        xs (array-like): values of the points
+        idxs (array-like): indexes of the points. If omitted, the points are
+            numbered consecutively after the ones already read.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        if idxs is None:
+            idxs = np.arange(self._history_length,
+                             self._history_length + xs.size, dtype=np.int64)
+        else:
+            idxs = np.asarray(idxs, dtype=np.int64)
+
+        # Feed points one by one until the two-point state is initialized
+        start = 0
+        while self._history_length < 2 and start < xs.size:
+            self.add_point(x=float(xs[start]), idx=int(idxs[start]))
+            start += 1
+        if start == xs.size:
+            return
+
+        xs_batch = xs[start:]
+        idx_batch = idxs[start:]
+        self._sum += float(xs_batch.sum())
+        self._history_length += int(xs_batch.size)
+
+        # Prepend the pending point, then collapse runs of equal consecutive
+        # values keeping the last sample of each run (as _check_reversal does
+        # by advancing _idx_last on equal points).
+        v = np.concatenate(([self._x], xs_batch))
+        i = np.concatenate(([self._idx_last], idx_batch))
+        neq = v[1:] != v[:-1]
+        changes = np.flatnonzero(neq)
+
+        if changes.size == 0:
+            # The whole batch sits on the current plateau
+            self._idx_last = int(i[-1])
+            return
+
+        # The stopper keeps the index at which the value last changed, as in
+        # the scalar path where equal trailing points do not move the stopper.
+        stopper_idx = int(i[changes[-1] + 1])
+        keep = np.concatenate((neq, [True]))
+        v = v[keep]
+        i = i[keep]
+
+        # A point is a reversal when the derivative entering it and the one
+        # leaving it have opposite signs; the entering sign of the pending
+        # point is seeded from the stored state.
+        d = np.diff(v)
+        s = np.sign(d)
+        s_prev = np.concatenate(([self._d_last_sign], s[:-1]))
+        rev = np.flatnonzero(s_prev * s < 0)
+        new_n = self._rev_n + rev.size
+        if new_n > self._rev_val.shape[0]:
+            capacity = self._rev_val.shape[0]
+            while capacity < new_n:
+                capacity *= 2
+            self._rev_idx = np.resize(self._rev_idx, capacity)
+            self._rev_val = np.resize(self._rev_val, capacity)
+        self._rev_idx[self._rev_n:new_n] = i[rev]
+        self._rev_val[self._rev_n:new_n] = v[rev]
+        self._rev_n = new_n
+
+        # Close any cycles completed by the new reversals
+        for _ in self._reduce(save=True):
+            pass
+
+        self._x_last = float(v[-2])
+        self._x = float(v[-1])
+        # Plateaus are collapsed above, so the trailing delta cannot be zero
+        self._d_last_sign = 1 if d[-1] > 0 else -1
+        self._idx_last = int(i[-1])
+        self._stopper = (stopper_idx, float(v[-1]))
+
     def _check_reversal(self, x: float, idx: int) -> None:
         """
         Check if the provided point is a reversal point.
@@ -101,33 +362,252 @@ class Dropflow:
             
         elif self._history_length == 1:
             self._x = x
-            self._d_last = (x - self._x_last)
-            self._reversals.append((self._idx_last, self._x_last))
+            d = x - self._x_last
+            self._d_last_sign = (d > 0) - (d < 0)
+            self._push_reversal(self._idx_last, self._x_last)
             self._idx_last = idx
         
         else:
-            if x == self._x:
+            # Read the current value once: every self._x load below would be
+            # a separate dict lookup on this hottest of paths
+            x_cur = self._x
+            if x == x_cur:
                 self._idx_last = idx
                 return
             
-            # Here we decide if the last point is a reversal or not
-            d_next = (x - self._x)
-            
-            if self._d_last * d_next < 0:
-                self._reversals.append((self._idx_last, self._x))
-            self._x_last, self._x = self._x, x
-            self._d_last = d_next
+            # Here we decide if the last point is a reversal or not.
+            # Only the signs of the two deltas matter: keep the last one as
+            # an int in {-1, 0, +1} and compare with an integer product, which
+            # is exact (no float underflow) and cheap. A zero sign (flat start
+            # of the series) is never a sign change.
+            d_next = x - x_cur
+            s = (d_next > 0) - (d_next < 0)
+
+            if s * self._d_last_sign < 0:
+                self._push_reversal(self._idx_last, x_cur)
+                self._close_cycles()
+            self._x_last = x_cur
+            self._x = x
+            self._d_last_sign = s
             self._idx_last = idx
             
             # A new point is always a reversal until the following point is read
             self._stopper = (idx, x)
-            
+
+    def _close_cycles(self) -> None:
+        """
+        Close cycles from the top of the reversal stack as soon as a reversal
+        is confirmed, so that the stack only ever holds the open residue and
+        the extraction methods become a drain of already-computed cycles.
+        """
+        v = self._rev_val
+        ix = self._rev_idx
+        n = self._rev_n
+        cc_rng, cc_mean, cc_count = self._cc_rng, self._cc_mean, self._cc_count
+        cc_i1, cc_i2 = self._cc_i1, self._cc_i2
+        while n >= 3:
+            # Form ranges X and Y from the three most recent points; compare
+            # the squared differences to skip the two abs calls per iteration
+            x1, x2, x3 = v[n-3], v[n-2], v[n-1]
+            dX = x3 - x2
+            dY = x2 - x1
+
+            if dX * dX < dY * dY:
+                break
+            Y = -dY if dY < 0.0 else dY
+
+            if n == 3:
+                # Y contains the starting point
+                # Count Y as one-half cycle and discard the first point
+                cc_rng.append(Y)
+                cc_mean.append((x1 + x2) * 0.5)
+                cc_count.append(0.5)
+                cc_i1.append(ix[0])
+                cc_i2.append(ix[1])
+                v[0] = v[1]
+                ix[0] = ix[1]
+                v[1] = v[2]
+                ix[1] = ix[2]
+                n = 2
+            else:
+                # Count Y as one cycle and discard the peak and the valley of Y
+                cc_rng.append(Y)
+                cc_mean.append((x1 + x2) * 0.5)
+                cc_count.append(1.0)
+                cc_i1.append(ix[n-3])
+                cc_i2.append(ix[n-2])
+                v[n-3] = v[n-1]
+                ix[n-3] = ix[n-1]
+                n -= 2
+        self._rev_n = n
+
+    def _reduce(self, save, stopper=None):
+        """
+        Run the rainflow reduction over the current reversals, dispatching to
+        the numba kernel when available and to the pure-Python stack reducer
+        otherwise.
+
+        Parameters
+        ----------
+        save (bool): if True, emitted cycles are also appended to the closed-cycle buffers.
+        stopper (tuple): optional (index, value) pending point fed to the
+            reduction after the stored reversals, without being appended to
+            the reversal buffers; it always survives the reduction and is
+            excluded from the residue written back.
+        """
+        if self._rev_n + (stopper is not None) < 3:
+            # Fewer than three points can never close a cycle; hand back a
+            # plain empty iterator instead of spinning up a reducer. This is
+            # the common case when the extractors are polled per sample.
+            return iter(())
+        if _HAS_NUMBA and self._rev_n >= _KERNEL_THRESHOLD:
+            return self._run_kernel(save, stopper)
+        return self._run_python(save, stopper)
+
+    def _run_python(self, save, stopper=None):
+        """
+        Pure-Python rainflow reduction: the reversal points are treated
+        strictly as a stack, so consumed points are removed with O(1) tail
+        pops instead of positional list.pop(i) shifts, keeping a full
+        extraction linear in the number of reversals.
+
+        Parameters
+        ----------
+        save (bool): if True, emitted cycles are also appended to the closed-cycle buffers.
+        stopper (tuple): optional pending point reduced after the stored
+            reversals, see _reduce.
+        """
+        # Bind hot names to locals: saves an attribute lookup per access in
+        # the loop below
+        cc_rng, cc_mean, cc_count = self._cc_rng, self._cc_mean, self._cc_count
+        cc_i1, cc_i2 = self._cc_i1, self._cc_i2
+        points = self._residue_points()
+        if stopper is not None:
+            points.append(stopper)
+        stack = []
+        # The stack depth is tracked manually so the loop never calls len().
+        # The diffs of the two topmost stack pairs are carried between
+        # iterations: the X of one comparison becomes the Y of the next when
+        # a point is pushed, so each push costs one new subtraction instead
+        # of recomputing both ranges per check.
+        sp = 0
+        d_top = 0.0
+        for point in points:
+            stack.append(point)
+            sp += 1
+            if sp < 2:
+                continue
+            d_below = d_top
+            d_top = stack[-1][1] - stack[-2][1]
+
+            while sp >= 3:
+                # Compare the squared ranges X (top pair) and Y (pair below):
+                # they order the same way as the absolute values, without the
+                # two abs calls per iteration
+                dX = d_top
+                dY = d_below
+                if dX * dX < dY * dY:
+                    # Read the next point
+                    break
+                Y = -dY if dY < 0.0 else dY
+
+                if sp == 3:
+                    # Y contains the starting point
+                    # Count Y as one-half cycle and discard the first point
+                    i1, y1 = stack[0]
+                    i2, y2 = stack[1]
+                    cycle = Cycle(Y, (y1 + y2) * 0.5, 0.5, i1, i2)
+                    del stack[0]
+                    sp -= 1
+                else:
+                    # Count Y as one cycle and discard the peak and the valley of Y
+                    i1, x1 = stack[-3]
+                    i2, x2 = stack[-2]
+                    cycle = Cycle(Y, (x1 + x2) * 0.5, 1.0, i1, i2)
+                    del stack[-3:-1]
+                    sp -= 2
+                    # The pop changed both top pairs: refresh the carried diffs
+                    d_top = stack[-1][1] - stack[-2][1]
+                    if sp >= 3:
+                        d_below = stack[-2][1] - stack[-3][1]
+
+                if save:
+                    cc_rng.append(cycle.rng)
+                    cc_mean.append(cycle.mean)
+                    cc_count.append(cycle.count)
+                    cc_i1.append(cycle.i1)
+                    cc_i2.append(cycle.i2)
+                yield cycle
+
+        if stopper is not None:
+            # The pending point always survives on top of the stack; it is
+            # not part of the stored residue
+            stack.pop()
+            sp -= 1
+        if sp:
+            idxs, vals = zip(*stack)
+            self._rev_idx[:sp] = idxs
+            self._rev_val[:sp] = vals
+        self._rev_n = sp
+
+    def _run_kernel(self, save, stopper=None):
+        """
+        Run the rainflow reduction kernel over the current reversals.
+
+        The kernel runs directly on views of the _rev_val/_rev_idx buffers
+        (which numba compiles to a tight loop); the residue is compacted in
+        place at the front of the buffers and the emitted cycles are yielded.
+
+        Parameters
+        ----------
+        save (bool): if True, emitted cycles are also appended to the closed-cycle buffers.
+        stopper (tuple): optional pending point reduced after the stored
+            reversals, see _reduce.
+        """
+        n = self._rev_n
+        if stopper is not None:
+            # Stage the pending point in the scratch slot past the residue;
+            # _rev_n keeps excluding it, so the stored state is untouched
+            if n == self._rev_val.shape[0]:
+                self._rev_idx = np.resize(self._rev_idx, 2 * n)
+                self._rev_val = np.resize(self._rev_val, 2 * n)
+            self._rev_idx[n] = stopper[0]
+            self._rev_val[n] = stopper[1]
+            n += 1
+        # Two scratch blocks instead of five separate allocations; each row
+        # is a contiguous view the kernel fills independently
+        out_f = np.empty((3, n), dtype=np.float64)
+        out_i = np.empty((2, n), dtype=np.int64)
+        out_rng, out_mean, out_count = out_f
+        out_i1, out_i2 = out_i
+
+        m, residue = _rainflow_stack(self._rev_val[:n], self._rev_idx[:n],
+                                     out_rng, out_mean, out_count, out_i1, out_i2)
+        # The pending point, when fed, always ends up on top of the residue
+        # and stays out of the stored count
+        self._rev_n = residue - 1 if stopper is not None else residue
+
+        if save and m:
+            # Bulk-append into the typed buffers: a straight memory copy,
+            # no per-cycle Python objects
+            self._cc_rng.frombytes(out_rng[:m].tobytes())
+            self._cc_mean.frombytes(out_mean[:m].tobytes())
+            self._cc_count.frombytes(out_count[:m].tobytes())
+            self._cc_i1.frombytes(out_i1[:m].tobytes())
+            self._cc_i2.frombytes(out_i2[:m].tobytes())
+
+        for k in range(m):
+            yield Cycle(float(out_rng[k]), float(out_mean[k]), float(out_count[k]),
+                        int(out_i1[k]), int(out_i2[k]))
+
     def extract_all_cycles(self, ignore_stopper=False):
         """
         Iterate closed cycles and half cycles.
-        In this method we append the closed cycles within the attribute _closed_cycles and pop 
-        the relative points from the reversals.
-        Instead, the half cycles are yielded and relative points are not popped from the reversals.
+        Closed cycles are yielded once across calls: a cursor remembers how
+        many were already emitted, so a streaming consumer polling this
+        method does not re-pay for the whole history every time. The half
+        cycles of the open residue are yielded on every call and their
+        points are not consumed.
 
         Parameters
         ----------
@@ -138,57 +618,38 @@ class Dropflow:
         cycle : tuple
             Each tuple contains (range, mean, count, start index, end index).
             Count equals to 1.0 for full cycles and 0.5 for half cycles.
-        """ 
-        self._reversals.extend([self._stopper]) if self._stopper and not ignore_stopper else None
-        
-        if len(self._closed_cycles) == 0 and len(self._reversals) < 1:
-            print("Not enough samples")
-            return []
-        
-        # Yield already closed cycles
-        for cycle in self._closed_cycles:
+        """
+        stopper = self._stopper if self._stopper and not ignore_stopper else None
+
+        if len(self._cc_rng) == 0 and self._rev_n < 1:
+            # Nothing to emit yet: finish the (empty) generator quietly
+            return
+
+        # Close the cycles the stopper completes before yielding anything:
+        # the Python reducer writes its residue back only once exhausted, so
+        # draining it eagerly keeps the saved cycles and the residue in sync
+        # even if the caller abandons this generator mid-iteration
+        for _ in self._reduce(save=True, stopper=stopper):
+            pass
+
+        # Yield the closed cycles not yielded by a previous call
+        for cycle in self._cycles_from(self._yield_cursor):
             yield cycle
-                    
-        i = 0
-        while i < (len(self._reversals) - 2):
-            # Form ranges X and Y from the three most recent points
-            x1, x2, x3 = self._reversals[i][1], self._reversals[i+1][1], self._reversals[i+2][1]
-            X = abs(x3 - x2)
-            Y = abs(x2 - x1)
-            
-            if X < Y:
-                # Read the next point
-                i += 1
-            else:
-                if i == 0:
-                    # Y contains the starting point
-                    # Count Y as one-half cycle and discard the first point
-                    self._closed_cycles.append(format_output(self._reversals[i], self._reversals[i+1], 0.5))
-                    self._reversals.pop(i)
-                    yield self._closed_cycles[-1]
-                else:
-                    # Count Y as one cycle and discard the peak and the valley of Y
-                    self._closed_cycles.append(format_output(self._reversals[i], self._reversals[i+1], 1.0))
-                    self._reversals.pop(i)
-                    self._reversals.pop(i)
-                    yield self._closed_cycles[-1]
-                
-        else:
-            # Count the remaining ranges as one-half cycles 
-            for i in range(len(self._reversals) - 1):
-                yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                i -= 1
-            
-            if not ignore_stopper and self._reversals[-1] == self._stopper:
-                self._reversals.pop()
-            
-            
+        self._yield_cursor = len(self._cc_rng)
+
+        # Count the remaining ranges as one-half cycles
+        for cycle in self._drain_residue(stopper):
+            yield cycle
+
+
     def extract_new_cycles(self, ignore_stopper=False):
         """
-        Iterate closed cycles and half cycles.
-        In this method we don't save the closed cycles and we delegate the user to save them.
-        Indeed, we just yield the new closed cycles or half cycles.
-        
+        Iterate the closed cycles that were not yielded by a previous call.
+        Since cycles are closed incrementally while points are added, this is
+        a drain of the already-computed queue: only the cycles appended after
+        the last call are yielded. The still-open ranges are not emitted here,
+        use finalize for that.
+
         Parameters
         ----------
         ignore_stopper (bool): if True, the last point (stopper) is not considered as a reversal point.
@@ -198,44 +659,62 @@ class Dropflow:
         cycle : tuple
             Each tuple contains (range, mean, count, start index, end index).
             Count equals to 1.0 for full cycles and 0.5 for half cycles.
-        """         
-        self._reversals.extend([self._stopper]) if self._stopper and not ignore_stopper else None
-        
-        if len(self._reversals) < 1:
-            print("Not enough samples")
-            return []
-        
-        i = 0
-        while i < (len(self._reversals) - 2):
-            # Form ranges X and Y from the three most recent points
-            x1, x2, x3 = self._reversals[i][1], self._reversals[i+1][1], self._reversals[i+2][1]
-            X = abs(x3 - x2)
-            Y = abs(x2 - x1)
-            
-            if X < Y:
-                # Read the next point
-                i += 1
-            else:
-                if i == 0:
-                    # Y contains the starting point
-                    # Count Y as one-half cycle and discard the first point
-                    yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                    self._reversals.pop(i)
-                else:
-                    # Count Y as one cycle and discard the peak and the valley of Y
-                    yield format_output(self._reversals[i], self._reversals[i+1], 1.0)
-                    self._reversals.pop(i)
-                    self._reversals.pop(i)
-                
-        else:
-            # Count the remaining ranges as one-half cycles 
-            for i in range(len(self._reversals) - 1):
-                yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                i -= 1
-                
-            if not ignore_stopper and self._reversals[-1] == self._stopper:
-                self._reversals.pop()
-                
+        """
+        stopper = self._stopper if self._stopper and not ignore_stopper else None
+
+        if self._rev_n < 1:
+            # Nothing to emit yet: finish the (empty) generator quietly
+            return
+
+        # Close the cycles that the stopper completes
+        for _ in self._reduce(save=True, stopper=stopper):
+            pass
+
+        for cycle in self._cycles_from(self._cursor):
+            yield cycle
+        self._cursor = len(self._cc_rng)
+
+    def _drain_residue(self, stopper=None):
+        """
+        Yield the still-open ranges as one-half cycles, walking the residue
+        (plus the optional pending point) pairwise; zip iterates the adjacent
+        pairs at C level instead of indexing the list twice per step. Nothing
+        is consumed.
+        """
+        points = self._residue_points()
+        if stopper is not None:
+            points.append(stopper)
+        for (i1, x1), (i2, x2) in zip(points, points[1:]):
+            rng = x1 - x2 if x1 > x2 else x2 - x1
+            yield Cycle(rng, (x1 + x2) * 0.5, 0.5, i1, i2)
+
+    def extract_since_last_call(self, ignore_stopper=False):
+        """
+        Alias of extract_new_cycles: iterate only the cycles closed since the
+        previous drain, the natural call for a consumer polling the stream.
+        """
+        return self.extract_new_cycles(ignore_stopper=ignore_stopper)
+
+    def finalize(self, ignore_stopper=False):
+        """
+        Iterate the remaining open ranges as one-half cycles, without
+        consuming them: the reversal stack is left untouched, so the stream
+        can keep growing afterwards.
+
+        Parameters
+        ----------
+        ignore_stopper (bool): if True, the last point (stopper) is not considered as a reversal point.
+
+        Yields
+        ------
+        cycle : tuple
+            Each tuple contains (range, mean, count, start index, end index).
+            Count is always 0.5.
+        """
+        stopper = self._stopper if self._stopper and not ignore_stopper else None
+        return self._drain_residue(stopper)
+
+
 
 def test():
     series = [
@@ -284,4 +763,5 @@ def test2():
     for cycle in dropflow.extract_all_cycles():
         print(cycle)
     
-test()
+if __name__ == "__main__":
+    test()
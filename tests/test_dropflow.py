@@ -1,241 +1,8 @@
 from __future__ import division
-from collections import deque, defaultdict
-import itertools
-import random
-import rainflow
 import math
 import pytest
 
-
-def format_output(point1, point2, count):
-            i1, x1 = point1
-            i2, x2 = point2
-            rng = abs(x1 - x2)
-            mean = 0.5 * (x1 + x2)
-            return rng, mean, count, i1, i2
-
-
-class Dropflow:
-    """
-    Class of the incremental rainflow cycle counting algorithm.
-    The name Dropflow represents the idea of dropping a point at time instead of the 
-    entire "rain" of points at once.
-    
-    Attributes
-    ----------
-    _reversals (list): list of tuples containing the indexes and values of the reversal points.
-    _stopper (tuple): tuple containing the index and value of the last point that in the original
-        algorithm is threated as a reversal point. Here, since we are working with incremental data,
-        we don't know if the last point is a reversal point until the next point is read. Thus, we
-        store the last point in the _stopper attribute and update it when the next point is read.
-    _closed_cycles (list): list of tuples containing the indexes and values of the closed cycles. This
-        attribute is used to store the closed cycles and half cycles that are already formed when the 
-        user calls the method extract_all_cycles. Otherwise, the method extract_new_cycles yields only
-        the new closed cycles or half cycles.
-    _mean (float): mean value of the series.
-    _history_length (int): number of points read.
-    _idx_last (int): index of the last point read.
-    _x_last (float): value of the last point read.
-    _x (float): value of the current point.
-    _d_last (float): difference between the last two points read.
-    """
-    def __init__(self) -> None:
-        self._reversals = []
-        self._stopper = ()
-        self._closed_cycles = []
-
-        self._mean = 0
-        self._history_length = 0
-        self._idx_last = None
-        self._x_last = None
-        self._x = None
-        self._d_last = None
-    
-    @property
-    def reversals(self):
-        if self._history_length < 2:
-            return []
-        return self._reversals + [self._stopper] if self._stopper else self._reversals
-        
-    def reset(self):
-        self._reversals = []
-        self._stopper = ()
-        self._closed_cycles = []
-
-        self._mean = 0
-        self._history_length = 0
-        self._idx_last = None
-        self._x_last = None
-        self._x = None
-        self._d_last = None
-        
-    def add_point(self, x: float, idx: int) -> None:
-        """
-        Add a point to the series.
-        
-        Parameters
-        ----------
-        x (float): value of the point
-        idx (int): index of the point
-        """
-        self._check_reversal(x, idx)
-        self._mean = (self._mean * (self._history_length) + x) / (self._history_length + 1)
-        self._history_length += 1
-    
-    def _check_reversal(self, x: float, idx: int) -> None:
-        """
-        Check if the provided point is a reversal point.
-
-        A reversal point is a point in the series at which the first derivative
-        changes sign. Reversal is undefined at the first (last) point because the
-        derivative before (after) this point is undefined. The first and the last
-        points are treated as reversals.
-
-        Parameters
-        ----------
-        x (float): value of the point
-        idx (int): index of the point
-        """
-        if self._history_length == 0:
-            self._x_last = x
-            self._idx_last = 0
-            
-        elif self._history_length == 1:
-            self._x = x
-            self._d_last = (x - self._x_last)
-            self._reversals.append((self._idx_last, self._x_last))
-            self._idx_last = idx
-        
-        else:
-            if x == self._x:
-                self._idx_last = idx
-                return
-            
-            # Here we decide if the last point is a reversal or not
-            d_next = (x - self._x)
-            
-            if self._d_last * d_next < 0:
-                self._reversals.append((self._idx_last, self._x))
-            self._x_last, self._x = self._x, x
-            self._d_last = d_next
-            self._idx_last = idx
-            
-            # A new point is always a reversal until the following point is read
-            self._stopper = (idx, x)
-            
-    def extract_all_cycles(self, ignore_stopper=False):
-        """
-        Iterate closed cycles and half cycles.
-        In this method we append the closed cycles within the attribute _closed_cycles and pop 
-        the relative points from the reversals.
-        Instead, the half cycles are yielded and relative points are not popped from the reversals.
-
-        Parameters
-        ----------
-        ignore_stopper (bool): if True, the last point (stopper) is not considered as a reversal point.
-        
-        Yields
-        ------
-        cycle : tuple
-            Each tuple contains (range, mean, count, start index, end index).
-            Count equals to 1.0 for full cycles and 0.5 for half cycles.
-        """ 
-        self._reversals.extend([self._stopper]) if self._stopper and not ignore_stopper else None
-        
-        if len(self._closed_cycles) == 0 and len(self._reversals) < 1:
-            print("Not enough samples")
-            return []
-        
-        # Yield already closed cycles
-        for cycle in self._closed_cycles:
-            yield cycle
-                    
-        i = 0
-        while i < (len(self._reversals) - 2):
-            # Form ranges X and Y from the three most recent points
-            x1, x2, x3 = self._reversals[i][1], self._reversals[i+1][1], self._reversals[i+2][1]
-            X = abs(x3 - x2)
-            Y = abs(x2 - x1)
-            
-            if X < Y:
-                # Read the next point
-                i += 1
-            else:
-                if i == 0:
-                    # Y contains the starting point
-                    # Count Y as one-half cycle and discard the first point
-                    self._closed_cycles.append(format_output(self._reversals[i], self._reversals[i+1], 0.5))
-                    self._reversals.pop(i)
-                    yield self._closed_cycles[-1]
-                else:
-                    # Count Y as one cycle and discard the peak and the valley of Y
-                    self._closed_cycles.append(format_output(self._reversals[i], self._reversals[i+1], 1.0))
-                    self._reversals.pop(i)
-                    self._reversals.pop(i)
-                    yield self._closed_cycles[-1]
-                
-        else:
-            # Count the remaining ranges as one-half cycles 
-            for i in range(len(self._reversals) - 1):
-                yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                i -= 1
-            
-            if not ignore_stopper and self._reversals[-1] == self._stopper:
-                self._reversals.pop()
-            
-            
-    def extract_new_cycles(self, ignore_stopper=False):
-        """
-        Iterate closed cycles and half cycles.
-        In this method we don't save the closed cycles and we delegate the user to save them.
-        Indeed, we just yield the new closed cycles or half cycles.
-        
-        Parameters
-        ----------
-        ignore_stopper (bool): if True, the last point (stopper) is not considered as a reversal point.
-
-        Yields
-        ------
-        cycle : tuple
-            Each tuple contains (range, mean, count, start index, end index).
-            Count equals to 1.0 for full cycles and 0.5 for half cycles.
-        """         
-        self._reversals.extend([self._stopper]) if self._stopper and not ignore_stopper else None
-        
-        if len(self._reversals) < 1:
-            print("Not enough samples")
-            return []
-        
-        i = 0
-        while i < (len(self._reversals) - 2):
-            # Form ranges X and Y from the three most recent points
-            x1, x2, x3 = self._reversals[i][1], self._reversals[i+1][1], self._reversals[i+2][1]
-            X = abs(x3 - x2)
-            Y = abs(x2 - x1)
-            
-            if X < Y:
-                # Read the next point
-                i += 1
-            else:
-                if i == 0:
-                    # Y contains the starting point
-                    # Count Y as one-half cycle and discard the first point
-                    yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                    self._reversals.pop(i)
-                else:
-                    # Count Y as one cycle and discard the peak and the valley of Y
-                    yield format_output(self._reversals[i], self._reversals[i+1], 1.0)
-                    self._reversals.pop(i)
-                    self._reversals.pop(i)
-                
-        else:
-            # Count the remaining ranges as one-half cycles 
-            for i in range(len(self._reversals) - 1):
-                yield format_output(self._reversals[i], self._reversals[i+1], 0.5)
-                i -= 1
-                
-            if not ignore_stopper and self._reversals[-1] == self._stopper:
-                self._reversals.pop()
+from dropflow import Dropflow, _KERNEL_THRESHOLD
 
 dropflow = Dropflow()
 
@@ -345,15 +112,23 @@ TEST_CASE_3 = (
 )
 
 
-@pytest.mark.parametrize(
-    ("series", "cycles", "counts", "approx"),
-    [TEST_CASE_1, TEST_CASE_2, TEST_CASE_3],
+@pytest.fixture(
+    scope="module",
+    params=[TEST_CASE_1, TEST_CASE_2, TEST_CASE_3],
+    ids=["tc1", "tc2", "tc3"],
 )
-def test_extract_cycles(series, cycles, counts, approx):
-    dropflow.reset()
-    for idx, point in enumerate(series):
-        dropflow.add_point(x=point, idx=idx)
-    result = list(dropflow.extract_all_cycles())
+def prepared(request):
+    # Feed each series once per module and share the resulting state and
+    # extraction across the tests below instead of redoing the pass per test
+    series, cycles, counts, approx = request.param
+    instance = Dropflow()
+    instance.add_points(series)
+    result = list(instance.extract_all_cycles())
+    return series, cycles, approx, instance, result
+
+
+def test_extract_cycles(prepared):
+    series, cycles, approx, instance, result = prepared
     if approx:
         expected = [
             (pytest.approx(rng), pytest.approx(mean), count, i, j)
@@ -364,6 +139,36 @@ def test_extract_cycles(series, cycles, counts, approx):
     assert result == expected
 
 
+def test_add_point_matches_add_points():
+    series = TEST_CASE_2[0]
+    streamed = Dropflow()
+    for idx, point in enumerate(series):
+        streamed.add_point(x=point, idx=idx)
+    batched = Dropflow()
+    batched.add_points(series)
+    assert list(streamed.extract_all_cycles()) == list(batched.extract_all_cycles())
+
+
+def test_kernel_batch_matches_scalar():
+    # A single batch whose reversal count is far above _KERNEL_THRESHOLD
+    # routes the reduction through the numba kernel (when numba is
+    # installed); the scalar path closes cycles incrementally and never
+    # leaves the Python reducer. Both must extract the same cycles.
+    series = [
+        0.8 * math.sin(1.1 * i) + 0.3 * math.sin(0.23 * i) for i in range(500)
+    ]
+    batched = Dropflow()
+    batched.add_points(series)
+    streamed = Dropflow()
+    for idx, point in enumerate(series):
+        streamed.add_point(x=point, idx=idx)
+    result = list(batched.extract_all_cycles())
+    assert result == list(streamed.extract_all_cycles())
+    # Enough cycles closed in that one batch to prove the reduction saw
+    # more reversals than the kernel dispatch threshold
+    assert len(batched.closed_cycles_array()) > _KERNEL_THRESHOLD
+
+
 @pytest.mark.parametrize(
     ("series", "cycles"),
     [
@@ -380,15 +185,9 @@ def test_extract_cycles_small_series(series, cycles):
     assert list(dropflow.extract_all_cycles()) == cycles
 
 
-@pytest.mark.parametrize(
-    ("series", "cycles", "counts", "approx"),
-    [TEST_CASE_1, TEST_CASE_2, TEST_CASE_3],
-)
-def test_reversals_yield_value(series, cycles, counts, approx):
-    dropflow.reset()
-    for idx, point in enumerate(series):
-        dropflow.add_point(x=point, idx=idx)
-    for index, value in dropflow.reversals:
+def test_reversals_yield_value(prepared):
+    series, cycles, approx, instance, result = prepared
+    for index, value in instance.reversals:
         assert value == series[index]
 
 